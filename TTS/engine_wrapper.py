@@ -1,24 +1,56 @@
+import hashlib
+import logging
 import os
 import re
+import shutil
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Tuple
 
-import numpy as np
 import translators
-from moviepy.audio.AudioClip import AudioClip
-from moviepy.audio.fx.volumex import volumex
-from moviepy.editor import AudioFileClip
+from mutagen.mp3 import MP3
 from rich.progress import track
 
 from utils import settings
 from utils.console import print_step, print_substep
 from utils.voice import sanitize_text
 
+log = logging.getLogger(__name__)
+
 DEFAULT_MAX_LENGTH: int = (
     50  # Video length variable, edit this on your own risk. It should work, but it's not supported
 )
 
+# Content-addressed cache of generated clips, keyed by sha256(text|voice|engine).
+# Delete the folder to invalidate; voice/engine changes already produce new keys.
+TTS_CACHE_DIR = Path("assets/tts_cache")
+
+# Every voice option an engine might read from settings; part of the cache key so
+# changing any of them never serves a stale clip.
+VOICE_SETTING_KEYS = (
+    "elevenlabs_voice_name",
+    "aws_polly_voice",
+    "streamlabs_polly_voice",
+    "tiktok_voice",
+    "python_voice",
+)
+
+# Compiled once at import; add_periods runs these on every comment
+URL_RE = re.compile(
+    r"((http|https)\:\/\/)?[a-zA-Z0-9\.\/\?\:@\-_=#]+\.([a-zA-Z]){2,6}([a-zA-Z0-9\.\&\/\?\:@\-_=#])*"
+)
+AI_RE = re.compile(r"\bAI\b")
+AGI_RE = re.compile(r"\bAGI\b")
+ELLIPSIS_RE = re.compile(r"\. \. \.|\.\. \. |\. \. ")  # the stray-dot patterns, collapsed to "."
+QUOTED_DOT_RE = re.compile(r'\."\.')
+# Matches the last char of a comment that needs a closing period appended; \x1f is
+# the column separator add_periods joins the bodies with
+MISSING_PERIOD_RE = re.compile(r"([^.\x1f])(?=\x1f|\Z)")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 
 class TTSEngine:
     """Calls the given TTS engine to reduce code duplication and allow multiple TTS engines.
@@ -31,6 +63,10 @@ class TTSEngine:
 
     Notes:
         tts_module must take the arguments text and filepath.
+        If run returns a number, it is trusted as the clip length in seconds and the
+        generated file is never probed. The legacy last_duration attribute is shared
+        state that parallel synthesis would race on, so it is only honored for modules
+        that also set thread_safe = False.
     """
 
     def __init__(
@@ -49,68 +85,173 @@ class TTSEngine:
         self.max_length = max_length
         self.length = 0
         self.last_clip_length = last_clip_length
+        self.cache_keys = {}  # filename -> cache key of freshly generated clips
+        self.cached_durations = {}  # filename -> duration read from the cache on a hit
 
     def add_periods(
         self,
     ):  # adds periods to the end of paragraphs (where people often forget to put them) so tts doesn't blend sentences
-        for comment in self.reddit_object["comments"]:
-            # remove links
-            regex_urls = r"((http|https)\:\/\/)?[a-zA-Z0-9\.\/\?\:@\-_=#]+\.([a-zA-Z]){2,6}([a-zA-Z0-9\.\&\/\?\:@\-_=#])*"
-            comment["comment_body"] = re.sub(regex_urls, " ", comment["comment_body"])
-            comment["comment_body"] = comment["comment_body"].replace("\n", ". ")
-            comment["comment_body"] = re.sub(r"\bAI\b", "A.I", comment["comment_body"])
-            comment["comment_body"] = re.sub(r"\bAGI\b", "A.G.I", comment["comment_body"])
-            if comment["comment_body"][-1] != ".":
-                comment["comment_body"] += "."
-            comment["comment_body"] = comment["comment_body"].replace(". . .", ".")
-            comment["comment_body"] = comment["comment_body"].replace(".. . ", ".")
-            comment["comment_body"] = comment["comment_body"].replace(". . ", ".")
-            comment["comment_body"] = re.sub(r'\."\.', '".', comment["comment_body"])
+        comments = self.reddit_object["comments"]
+        if not comments:
+            return
+        # Join all bodies into one blob so each regex runs once per thread instead of
+        # once per comment; \x1f never appears in Reddit text and none of the patterns
+        # can match across it
+        blob = "\x1f".join(comment["comment_body"] for comment in comments)
+        blob = URL_RE.sub(" ", blob)  # remove links
+        blob = blob.replace("\n", ". ")
+        blob = AI_RE.sub("A.I", blob)
+        blob = AGI_RE.sub("A.G.I", blob)
+        blob = MISSING_PERIOD_RE.sub(r"\1.", blob)
+        blob = ELLIPSIS_RE.sub(".", blob)
+        blob = QUOTED_DOT_RE.sub('".', blob)
+        for comment, body in zip(comments, blob.split("\x1f")):
+            comment["comment_body"] = body
 
     def run(self) -> Tuple[int, int]:
         Path(self.path).mkdir(parents=True, exist_ok=True)
         print_step("Saving Text to MP3 files...")
 
-        self.add_periods()
-        self.call_tts("title", process_text(self.reddit_object["thread_title"]))
+        # Resolve the settings once instead of chaining dict lookups per comment
+        cfg = settings.config["settings"]
+        storymode = cfg["storymode"]
+        storymodemethod = cfg["storymodemethod"]
+        random_voice = cfg["tts"]["random_voice"]
+        post_lang = settings.config["reddit"]["thread"]["post_lang"]
+
+        # Comments are only spoken outside storymode, so don't clean what never
+        # reaches the TTS; storymode sanitizes a local copy of the post instead —
+        # the reddit object is rendered into the story images later, so the
+        # on-screen text must stay untouched
+        story_post = None
+        if storymode:
+            post = self.reddit_object["thread_post"]
+            if isinstance(post, str):
+                story_post = sanitize_story(post)
+            else:
+                story_post = [sanitize_story(part) for part in post]
+        else:
+            self.add_periods()
+
+        # Warm the translation cache with one batched request instead of one
+        # round-trip per clip; the process_text calls below then hit the cache
+        if post_lang:
+            if not storymode:
+                process_texts([c["comment_body"] for c in self.reddit_object["comments"]])
+            elif storymodemethod == 1:
+                process_texts(list(story_post))
+
+        self.call_tts("title", process_text(self.reddit_object["thread_title"]), random_voice)
         # processed_text = ##self.reddit_object["thread_post"] != ""
         idx = 0
 
-        if settings.config["settings"]["storymode"]:
-            if settings.config["settings"]["storymodemethod"] == 0:
-                if len(self.reddit_object["thread_post"]) > self.tts_module.max_chars:
-                    self.split_post(self.reddit_object["thread_post"], "postaudio")
+        if storymode:
+            if storymodemethod == 0:
+                if len(story_post) > self.tts_module.max_chars:
+                    self.split_post(story_post, "postaudio")
                 else:
-                    self.call_tts("postaudio", process_text(self.reddit_object["thread_post"]))
-            elif settings.config["settings"]["storymodemethod"] == 1:
-                for idx, text in track(enumerate(self.reddit_object["thread_post"])):
-                    self.call_tts(f"postaudio-{idx}", process_text(text))
+                    self.call_tts("postaudio", process_text(story_post), random_voice)
+            elif storymodemethod == 1:
+                post_parts = []
+                for idx, text in track(enumerate(story_post)):
+                    self.call_tts(f"postaudio-{idx}", process_text(text), random_voice)
+                    post_parts.append(f"postaudio-{idx}.mp3")
+                self.concat_post_parts(post_parts)
 
         else:
-            for idx, comment in track(enumerate(self.reddit_object["comments"]), "Saving..."):
-                # ! Stop creating mp3 files if the length is greater than max length.
-                if self.length > self.max_length and idx > 1:
-                    self.length -= self.last_clip_length
-                    idx -= 1
-                    break
-                if (
-                    len(comment["comment_body"]) > self.tts_module.max_chars
-                ):  # Split the comment if it is too long
-                    self.split_post(comment["comment_body"], idx)  # Split the comment
-                else:  # If the comment is not too long, just call the tts engine
-                    self.call_tts(f"{idx}", process_text(comment["comment_body"]))
+            concurrency = int(cfg["tts"]["tts_concurrency"])
+            if concurrency > 1 and getattr(self.tts_module, "thread_safe", True):
+                idx = self.call_tts_parallel(self.reddit_object["comments"], concurrency)
+            else:
+                for idx, comment in track(enumerate(self.reddit_object["comments"]), "Saving..."):
+                    # ! Stop creating mp3 files if the length is greater than max length.
+                    if self.length > self.max_length and idx > 1:
+                        self.length -= self.last_clip_length
+                        idx -= 1
+                        break
+                    if (
+                        len(comment["comment_body"]) > self.tts_module.max_chars
+                    ):  # Split the comment if it is too long
+                        self.split_post(comment["comment_body"], idx)  # Split the comment
+                    else:  # If the comment is not too long, just call the tts engine
+                        self.call_tts(f"{idx}", process_text(comment["comment_body"]), random_voice)
 
         print_substep("Saved Text to MP3 files successfully.", style="bold green")
         return self.length, idx
 
+    def concat_post_parts(self, post_parts):
+        """Stream-copies the storymode part clips into a single postaudio.mp3.
+
+        One concat-demuxer pass here means the final video assembly can read one file
+        instead of feeding every part through another decode+encode concat. The part
+        files stay on disk since the image overlay timing still reads their durations.
+
+        This is best-effort: if a part is missing (some engine error paths return
+        without writing a file) or the concat fails, no postaudio.mp3 is written and
+        the final assembly falls back to its per-part path, which silent-fills gaps.
+        """
+        if not post_parts:
+            return
+        if not all(os.path.exists(f"{self.path}/{part_file}") for part_file in post_parts):
+            log.warning("Some postaudio parts are missing, skipping the pre-concat")
+            return
+        with open(f"{self.path}/post_list.txt", "w") as f:
+            for part_file in post_parts:
+                f.write("file " + f"'{part_file}'" + "\n")
+
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-f",
+                    "concat",
+                    "-y",
+                    "-hide_banner",
+                    "-loglevel",
+                    "panic",
+                    "-safe",
+                    "0",
+                    "-i",
+                    f"{self.path}/post_list.txt",
+                    "-c",
+                    "copy",
+                    f"{self.path}/postaudio.mp3",
+                ],
+                check=True,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            log.warning("Concat of postaudio parts failed (%s), leaving the per-part files", e)
+            try:
+                # A partial output would shadow the fallback path downstream
+                os.unlink(f"{self.path}/postaudio.mp3")
+            except OSError:
+                pass
+
     def split_post(self, text: str, idx):
         split_files = []
-        split_text = [
-            x.group().strip()
-            for x in re.finditer(
-                r" *(((.|\n){0," + str(self.tts_module.max_chars) + "})(\.|.$))", text
-            )
-        ]
+        # Split on sentence boundaries and greedily pack them into max_chars chunks.
+        # This is linear in the text length, unlike the old bounded-quantifier regex
+        # that backtracked badly on long posts near the limit.
+        max_chars = self.tts_module.max_chars
+        split_text = []
+        buffer = ""
+        for sentence in SENTENCE_SPLIT_RE.split(text):
+            while len(sentence) > max_chars:  # a single run-on sentence, hard-split it
+                if buffer:
+                    split_text.append(buffer)
+                    buffer = ""
+                split_text.append(sentence[:max_chars].strip())
+                sentence = sentence[max_chars:]
+            if not sentence.strip():
+                continue
+            if buffer and len(buffer) + 1 + len(sentence) > max_chars:
+                split_text.append(buffer)
+                buffer = sentence.strip()
+            else:
+                buffer = f"{buffer} {sentence}".strip()
+        if buffer:
+            split_text.append(buffer)
+
         self.create_silence_mp3()
 
         idy = None
@@ -119,23 +260,51 @@ class TTSEngine:
             # print(f"{idx}-{idy}: {newtext}\n")
 
             if not newtext or newtext.isspace():
-                print("newtext was blank because sanitized split text resulted in none")
+                log.warning("newtext was blank because sanitized split text resulted in none")
                 continue
             else:
                 self.call_tts(f"{idx}-{idy}.part", newtext)
-                with open(f"{self.path}/list.txt", "w") as f:
-                    for idz in range(0, len(split_text)):
-                        f.write("file " + f"'{idx}-{idz}.part.mp3'" + "\n")
-                    split_files.append(str(f"{self.path}/{idx}-{idy}.part.mp3"))
-                    f.write("file " + f"'silence.mp3'" + "\n")
-
-                os.system(
-                    "ffmpeg -f concat -y -hide_banner -loglevel panic -safe 0 "
-                    + "-i "
-                    + f"{self.path}/list.txt "
-                    + "-c copy "
-                    + f"{self.path}/{idx}.mp3"
-                )
+                split_files.append(str(f"{self.path}/{idx}-{idy}.part.mp3"))
+
+        # MP3 frames are self-synchronizing, so byte-appending the parts plus the
+        # silence trailer is a valid stream — no ffmpeg spawn needed. ID3 tags are
+        # stripped first so no metadata blocks end up mid-stream.
+        try:
+            for part_file in split_files:
+                try:
+                    MP3(part_file).delete()
+                except Exception:
+                    pass  # untagged or unparseable, append it as-is
+            with open(f"{self.path}/{idx}.mp3", "wb") as out:
+                for part_file in split_files + [f"{self.path}/silence.mp3"]:
+                    with open(part_file, "rb") as part:
+                        shutil.copyfileobj(part, out)
+        except OSError as e:
+            log.warning("Byte-concat of split parts failed (%s), falling back to ffmpeg", e)
+            with open(f"{self.path}/list.txt", "w") as f:
+                for part_file in split_files:
+                    f.write("file " + f"'{os.path.basename(part_file)}'" + "\n")
+                f.write("file " + f"'silence.mp3'" + "\n")
+
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-f",
+                    "concat",
+                    "-y",
+                    "-hide_banner",
+                    "-loglevel",
+                    "panic",
+                    "-safe",
+                    "0",
+                    "-i",
+                    f"{self.path}/list.txt",
+                    "-c",
+                    "copy",
+                    f"{self.path}/{idx}.mp3",
+                ],
+                check=True,
+            )
         try:
             for i in range(0, len(split_files)):
                 os.unlink(split_files[i])
@@ -144,73 +313,290 @@ class TTSEngine:
         except OSError:
             print("OSError")
 
-    def call_tts(self, filename: str, text: str):
-        self.tts_module.run(
+    def call_tts_parallel(self, comments, concurrency: int) -> int:
+        """Synthesizes the comment clips with a bounded thread pool.
+
+        TTS backends are mostly network (cloud API) or model bound, so overlapping the
+        requests cuts the wall-clock roughly by the concurrency factor. Submission stays
+        at most `concurrency` clips ahead of in-order consumption, and all duration
+        bookkeeping happens in the main thread, so the max-length truncation stops new
+        TTS requests almost as early as the serial loop would — important for paid,
+        per-character APIs.
+        """
+        random_voice = settings.config["settings"]["tts"]["random_voice"]
+        window = deque()  # submitted-but-unconsumed tasks, at most `concurrency` deep
+        idx = 0
+        truncated = False
+
+        def consume():
+            nonlocal idx, truncated
+            task_idx, comment, text, future = window.popleft()
+            # ! Stop creating mp3 files if the length is greater than max length.
+            if self.length > self.max_length and task_idx > 1:
+                self.length -= self.last_clip_length
+                idx = task_idx - 1
+                truncated = True
+                return
+            idx = task_idx
+            if future is None:
+                self.split_post(comment["comment_body"], task_idx)
+            else:
+                future.result()
+                self.accumulate_clip(f"{task_idx}", text)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for submit_idx, comment in track(enumerate(comments), "Saving..."):
+                # Drain the window before submitting ahead so the truncation check
+                # runs in submission order and can stop further spending
+                while len(window) >= concurrency and not truncated:
+                    consume()
+                if truncated:
+                    break
+                if len(comment["comment_body"]) > self.tts_module.max_chars:
+                    # Too long to synthesize in one request, handled serially on consume
+                    window.append((submit_idx, comment, None, None))
+                else:
+                    text = process_text(comment["comment_body"])
+                    window.append(
+                        (
+                            submit_idx,
+                            comment,
+                            text,
+                            executor.submit(self.synthesize, f"{submit_idx}", text, random_voice),
+                        )
+                    )
+            while window and not truncated:
+                consume()
+            for _, _, _, leftover in window:
+                if leftover is not None:
+                    leftover.cancel()
+        return idx
+
+    def call_tts(self, filename: str, text: str, random_voice=None):
+        self.synthesize(filename, text, random_voice)
+        self.accumulate_clip(filename, text)
+
+    def synthesize(self, filename: str, text: str, random_voice=None):
+        if random_voice is None:  # callers that pre-resolved the setting skip this lookup
+            random_voice = settings.config["settings"]["tts"]["random_voice"]
+        filepath = f"{self.path}/{filename}.mp3"
+        key = self.tts_cache_key(text)
+        if key is not None:
+            cached_mp3 = TTS_CACHE_DIR / f"{key}.mp3"
+            # Entries are published with an atomic rename below, so any visible
+            # file is complete even while other workers are writing the same key
+            if cached_mp3.is_file():
+                shutil.copyfile(cached_mp3, filepath)
+                try:
+                    self.cached_durations[filename] = float(
+                        (TTS_CACHE_DIR / f"{key}.dur").read_text()
+                    )
+                except (OSError, ValueError):
+                    pass  # no duration on record, accumulate_clip will measure it
+                return
+
+        reported = self.tts_module.run(
             text,
-            filepath=f"{self.path}/{filename}.mp3",
-            random_voice=settings.config["settings"]["tts"]["random_voice"],
+            filepath=filepath,
+            random_voice=random_voice,
         )
-        
+
+        # Engines that know their sample count can report the clip duration by
+        # returning it from run(), which is race-free under the thread pool. The
+        # last_duration attribute is shared state on the module, so it is only
+        # trusted for engines that declare thread_safe = False and run serially.
+        if not reported and not getattr(self.tts_module, "thread_safe", True):
+            reported = getattr(self.tts_module, "last_duration", None)
+        if reported:
+            self.cached_durations[filename] = reported
+
+        if key is not None and clip_is_valid(filepath):
+            TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Publish atomically: identical comment bodies ("[deleted]", "Yes.", ...)
+            # hash to the same key, and parallel workers may write it at the same
+            # time. Copying to a per-thread temp file and renaming it into place
+            # means a reader can never observe a half-written cache entry.
+            tmp_mp3 = TTS_CACHE_DIR / f"{key}.{threading.get_ident()}.tmp"
+            try:
+                shutil.copyfile(filepath, tmp_mp3)
+                os.replace(tmp_mp3, TTS_CACHE_DIR / f"{key}.mp3")
+                self.cache_keys[filename] = key
+            except OSError:
+                tmp_mp3.unlink(missing_ok=True)  # worst case the clip isn't cached
+
+    def write_cached_duration(self, filename: str, clip_duration: float):
+        key = self.cache_keys.pop(filename, None)
+        if key is not None:
+            try:
+                (TTS_CACHE_DIR / f"{key}.dur").write_text(str(clip_duration))
+            except OSError:
+                pass  # cache miss next time costs one extra measurement
+
+    def tts_cache_key(self, text: str):
+        if settings.config["settings"]["tts"]["random_voice"]:
+            return None  # every call may pick a different voice, clips aren't reusable
+        voice = "|".join(
+            str(settings.config["settings"]["tts"].get(key) or "") for key in VOICE_SETTING_KEYS
+        )
+        return hashlib.sha256(
+            f"{text}|{voice}|{type(self.tts_module).__name__}".encode()
+        ).hexdigest()
+
+    def accumulate_clip(self, filename: str, text: str):
+        # Cache hits and self-reporting engines already know their duration,
+        # skip measuring entirely
+        clip_duration = self.cached_durations.pop(filename, 0)
+        if clip_duration > 0:
+            self.last_clip_length = clip_duration
+            self.length += clip_duration
+            self.write_cached_duration(filename, clip_duration)
+            return
+
         # Método más robusto para calcular duración del audio
-        clip_duration = 0
         audio_file_path = f"{self.path}/{filename}.mp3"
-        
-        # Método 1: Usar FFprobe para obtener duración (más confiable)
+        estimated = False
+
+        # Método 1: mutagen parses the MP3/Xing header in-process (no fork, O(1) read)
         try:
-            result = subprocess.run([
-                'ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', audio_file_path
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-            
-            clip_duration = float(result.stdout.strip())
-            print(f"[DEBUG] FFprobe detected duration for {filename}: {clip_duration}s")
-            
-        except (subprocess.CalledProcessError, ValueError, FileNotFoundError) as e:
-            print(f"[WARNING] FFprobe failed for {filename}: {e}")
-            
-            # Método 2: Fallback a MoviePy
+            clip_duration = MP3(audio_file_path).info.length
+            log.debug("mutagen detected duration for %s: %ss", filename, clip_duration)
+
+        except Exception as mutagen_error:
+            log.warning("mutagen failed for %s: %s", filename, mutagen_error)
+
+            # Método 2: Fallback a FFprobe
             try:
-                clip = AudioFileClip(audio_file_path)
-                clip_duration = clip.duration
-                clip.close()
-                print(f"[DEBUG] MoviePy detected duration for {filename}: {clip_duration}s")
-                
-            except Exception as moviepy_error:
-                print(f"[ERROR] Both FFprobe and MoviePy failed for {filename}: {moviepy_error}")
-                
+                result = subprocess.run([
+                    'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+                    '-of', 'default=noprint_wrappers=1:nokey=1', audio_file_path
+                ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+
+                clip_duration = float(result.stdout.strip())
+                log.debug("FFprobe detected duration for %s: %ss", filename, clip_duration)
+
+            except (subprocess.CalledProcessError, ValueError, FileNotFoundError) as e:
+                log.error("Both mutagen and FFprobe failed for %s: %s", filename, e)
+
                 # Método 3: Fallback final - usar duración estimada basada en texto
                 # Aproximadamente 150 palabras por minuto de lectura
                 word_count = len(text.split())
                 estimated_duration = (word_count / 150) * 60  # convertir a segundos
                 clip_duration = max(1, estimated_duration)  # mínimo 1 segundo
-                print(f"[WARNING] Using estimated duration for {filename}: {clip_duration}s (based on {word_count} words)")
+                estimated = True
+                log.warning("Using estimated duration for %s: %ss (based on %s words)", filename, clip_duration, word_count)
         
         # Actualizar duraciones solo si obtuvimos una duración válida
         if clip_duration > 0:
             self.last_clip_length = clip_duration
             self.length += clip_duration
-            print(f"[DEBUG] Updated total length: {self.length}s (added {clip_duration}s)")
+            log.debug("Updated total length: %ss (added %ss)", self.length, clip_duration)
+            if estimated:
+                # A word-count guess must not be persisted as a measured duration
+                self.cache_keys.pop(filename, None)
+            else:
+                self.write_cached_duration(filename, clip_duration)
         else:
-            print(f"[ERROR] Could not determine duration for {filename}, skipping duration update")
+            log.error("Could not determine duration for %s, skipping duration update", filename)
             # NO resetear self.length a 0, solo no agregar nada
             self.last_clip_length = 0
 
     def create_silence_mp3(self):
         silence_duration = settings.config["settings"]["tts"]["silence_duration"]
-        silence = AudioClip(
-            make_frame=lambda t: np.sin(440 * 2 * np.pi * t),
-            duration=silence_duration,
-            fps=44100,
-        )
-        silence = volumex(silence, 0)
-        silence.write_audiofile(f"{self.path}/silence.mp3", fps=44100, verbose=False, logger=None)
+        # Silence never changes, so generate it once per duration and reuse it across runs
+        cached = Path(f"assets/silence_{silence_duration}.mp3")
+        if not cached.is_file():
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-y",
+                    "-hide_banner",
+                    "-loglevel",
+                    "panic",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "anullsrc=r=44100:cl=stereo",
+                    "-t",
+                    str(silence_duration),
+                    "-q:a",
+                    "9",
+                    str(cached),
+                ],
+                check=True,
+            )
+        target = f"{self.path}/silence.mp3"
+        try:
+            if os.path.exists(target):
+                os.unlink(target)
+            os.link(cached, target)
+        except OSError:  # cross-device link or unsupported filesystem
+            shutil.copyfile(cached, target)
+
+
+def clip_is_valid(filepath: str) -> bool:
+    """Checks that a generated clip is playable MP3 before it's trusted.
+
+    Some engine error paths write garbage without raising (e.g. the body of an HTTP
+    error response); that must never be published into the persistent cache.
+    """
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return False
+    try:
+        return MP3(filepath).info.length > 0
+    except Exception:
+        return False
+
+
+def sanitize_story(text: str) -> str:
+    """Applies the same URL/AI/AGI cleanup as add_periods, but to storymode text."""
+    text = URL_RE.sub(" ", text)
+    text = AI_RE.sub("A.I", text)
+    return AGI_RE.sub("A.G.I", text)
+
+
+# (lang, original text) -> translated text, so re-renders and repeated fragments
+# never pay the HTTPS round-trip twice
+_translate_cache = {}
+
+# Record separator, a character Google Translate passes through untouched
+TRANSLATE_DELIMITER = "\n␞\n"
 
 
 def process_text(text: str, clean: bool = True):
     lang = settings.config["reddit"]["thread"]["post_lang"]
     new_text = sanitize_text(text) if clean else text
     if lang:
-        print_substep("Translating Text...")
-        translated_text = translators.translate_text(text, translator="google", to_language=lang)
+        translated_text = _translate_cache.get((lang, text))
+        if translated_text is None:
+            print_substep("Translating Text...")
+            translated_text = translators.translate_text(
+                text, translator="google", to_language=lang
+            )
+            _translate_cache[(lang, text)] = translated_text
         new_text = sanitize_text(translated_text)
     return new_text
+
+
+def process_texts(texts, clean: bool = True):
+    """Processes a batch of fragments, translating them all in one request.
+
+    The fragments are joined with a delimiter, sent as a single translation call and
+    split back apart, turning O(fragments) round-trips into one. Falls back to the
+    per-fragment path in process_text if the delimiter doesn't survive translation.
+    """
+    lang = settings.config["reddit"]["thread"]["post_lang"]
+    if lang:
+        pending = [text for text in texts if (lang, text) not in _translate_cache]
+        if pending:
+            print_substep("Translating Text...")
+            try:
+                translated = translators.translate_text(
+                    TRANSLATE_DELIMITER.join(pending), translator="google", to_language=lang
+                )
+                pieces = translated.split("␞")
+                if len(pieces) == len(pending):
+                    for original, piece in zip(pending, pieces):
+                        _translate_cache[(lang, original)] = piece.strip()
+            except Exception:
+                pass  # cache stays cold, process_text translates one by one
+    return [process_text(text, clean) for text in texts]
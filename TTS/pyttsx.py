@@ -9,6 +9,7 @@ class pyttsx:
     def __init__(self):
         self.max_chars = 5000
         self.voices = []
+        self.thread_safe = False  # pyttsx3 engines can't run from worker threads
 
     def run(
         self,
@@ -0,0 +1,56 @@
+import json
+import subprocess
+from pathlib import Path
+
+CACHE_FILE = Path("assets/.duration_cache.json")
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def get_duration(path: str) -> float:
+    """Returns the media duration in seconds, only ffprobing when the file changed.
+
+    Results are persisted in assets/.duration_cache.json keyed by path plus the
+    file's mtime and size, so background files are probed once instead of on
+    every run and a re-download invalidates the entry automatically.
+    """
+    stat = Path(path).stat()
+    key = f"{path}|{stat.st_mtime_ns}|{stat.st_size}"
+    cache = _load_cache()
+    if key in cache:
+        return cache[key]
+
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    duration = float(result.stdout.strip())
+
+    # Drop entries for older versions of the same file before adding the new one
+    cache = {k: v for k, v in cache.items() if not k.startswith(path + "|")}
+    cache[key] = duration
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # failing to persist just costs one extra ffprobe next run
+    return duration
@@ -1,19 +1,22 @@
 import json
+import logging
 import random
 import re
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from random import randrange
 from typing import Any, Dict, Tuple
 
 import yt_dlp
-from moviepy.editor import AudioFileClip, VideoFileClip
-from moviepy.video.io.ffmpeg_tools import ffmpeg_extract_subclip
-from moviepy import *
 
 from utils import settings
 from utils.console import print_step, print_substep
+from utils.duration_cache import get_duration
+
+log = logging.getLogger(__name__)
 
 
 def load_background_options():
@@ -34,7 +37,14 @@ def load_background_options():
         pos = background_options["video"][name][3]
 
         if pos != "center":
-            background_options["video"][name][3] = lambda t: ("center", pos + t)
+            # Validate once at load instead of blowing up frame-by-frame mid-render
+            if not isinstance(pos, (int, float)):
+                raise ValueError(
+                    f"Invalid position '{pos}' for background video '{name}': expected 'center' or a number"
+                )
+            # pos is bound as a default argument; a bare closure would capture the
+            # loop variable and leave every entry pointing at the last value
+            background_options["video"][name][3] = lambda t, pos=pos: ("center", pos + t)
 
     return background_options
 
@@ -53,16 +63,16 @@ def get_start_and_end_times(video_length: int, length_of_clip: int) -> Tuple[int
     video_length = int(video_length)
     length_of_clip = int(length_of_clip)
     
-    print(f"[DEBUG] get_start_and_end_times called with video_length={video_length}, length_of_clip={length_of_clip}")
+    log.debug("get_start_and_end_times called with video_length=%s, length_of_clip=%s", video_length, length_of_clip)
     
     # Validar que video_length es positivo
     if video_length <= 0:
-        print(f"[ERROR] Invalid video_length: {video_length}. Setting minimum duration of 1 second.")
+        log.error("Invalid video_length: %s. Setting minimum duration of 1 second.", video_length)
         video_length = 1
     
     # Validar que tenemos suficiente contenido para el clip
     if length_of_clip <= video_length:
-        print(f"[ERROR] Background source ({length_of_clip}s) is too short for required video length ({video_length}s)")
+        log.error("Background source (%ss) is too short for required video length (%ss)", length_of_clip, video_length)
         # Si el clip es muy corto, usamos todo el clip disponible
         if length_of_clip > 0:
             return 0, length_of_clip
@@ -76,7 +86,7 @@ def get_start_and_end_times(video_length: int, length_of_clip: int) -> Tuple[int
     
     # Asegurar que tenemos al menos un margen mínimo
     if max_start_time < 0:
-        print(f"[WARNING] Insufficient margin. Using available clip length.")
+        log.warning("Insufficient margin. Using available clip length.")
         max_start_time = max(0, length_of_clip - video_length)
     
     # Seleccionar tiempo de inicio aleatorio con margen de seguridad
@@ -95,7 +105,7 @@ def get_start_and_end_times(video_length: int, length_of_clip: int) -> Tuple[int
     
     # Validación final para asegurar rangos válidos
     if end_time <= start_time:
-        print(f"[ERROR] Invalid time calculation: start={start_time}, end={end_time}, video_length={video_length}")
+        log.error("Invalid time calculation: start=%s, end=%s, video_length=%s", start_time, end_time, video_length)
         # Último recurso: usar el inicio del clip
         start_time = 0
         end_time = min(video_length, length_of_clip)
@@ -103,7 +113,7 @@ def get_start_and_end_times(video_length: int, length_of_clip: int) -> Tuple[int
         if end_time <= start_time:
             raise Exception(f"Unable to create valid time range from clip of {length_of_clip}s for video of {video_length}s")
     
-    print(f"[DEBUG] Generated valid time range: start={start_time}, end={end_time}, duration={end_time - start_time}")
+    log.debug("Generated valid time range: start=%s, end=%s, duration=%s", start_time, end_time, end_time - start_time)
     return start_time, end_time
 
 
@@ -170,6 +180,50 @@ def download_background_audio(background_config: Tuple[str, str, str]):
     print_substep("Background audio downloaded successfully! 🎉", style="bold green")
 
 
+# Hardware H.264 encoders in preference order, with quality settings roughly
+# matching libx264 -crf 22
+HW_ENCODER_ARGS = {
+    "h264_nvenc": ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"],
+    "h264_videotoolbox": ["-c:v", "h264_videotoolbox", "-b:v", "5M"],
+    "h264_qsv": ["-c:v", "h264_qsv", "-global_quality", "23"],
+}
+
+
+@lru_cache(maxsize=None)
+def get_hw_encoder() -> str:
+    """Returns the first hardware H.264 encoder this ffmpeg build lists, or ""."""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""
+    for encoder in HW_ENCODER_ARGS:
+        if encoder in result.stdout:
+            return encoder
+    return ""
+
+
+def get_video_codec(path: str) -> str:
+    """Returns the codec name of the first video stream, or "" when probing fails."""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries',
+             'stream=codec_name', '-of', 'default=noprint_wrappers=1:nokey=1', path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return ""
+
+
 def chop_background(background_config: Dict[str, Tuple], video_length: int, reddit_object: dict):
     """Generates the background audio and footage to be used in the video and writes it to assets/temp/background.mp3 and assets/temp/background.mp4
 
@@ -179,156 +233,193 @@ def chop_background(background_config: Dict[str, Tuple], video_length: int, redd
     """
     id = re.sub(r"[^\w\s-]", "", reddit_object["thread_id"])
 
-    if settings.config["settings"]["background"][f"background_audio_volume"] == 0:
-        print_step("Volume was set to 0. Skipping background audio creation . . .")
-    else:
-        print_step("Finding a spot in the backgrounds audio to chop...✂️")
-        print(background_config)
-        audio_choice = f"{background_config['audio'][2]}-{background_config['audio'][1]}"
-        audio_file_path = f"assets/backgrounds/audio/{audio_choice}"
-        print(f"[DEBUG] {audio_file_path}")
+    def _do_audio():
+        if settings.config["settings"]["background"][f"background_audio_volume"] == 0:
+            print_step("Volume was set to 0. Skipping background audio creation . . .")
+        else:
+            print_step("Finding a spot in the backgrounds audio to chop...✂️")
+            log.debug("%s", background_config)
+            audio_choice = f"{background_config['audio'][2]}-{background_config['audio'][1]}"
+            audio_file_path = f"assets/backgrounds/audio/{audio_choice}"
+            log.debug("%s", audio_file_path)
         
-        # Usar FFprobe para obtener la duración real del archivo
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', audio_file_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            audio_duration = float(result.stdout.strip())
-            print(f"[DEBUG] FFProbe detected audio duration: {audio_duration}")
+            # Usar FFprobe para obtener la duración real del archivo (cached across runs)
+            try:
+                audio_duration = get_duration(audio_file_path)
+                log.debug("FFProbe detected audio duration: %s", audio_duration)
             
-            # Verificar que tenemos suficiente duración
-            if audio_duration <= video_length + 2:  # +2 para margen de seguridad
-                print_substep(f"Audio duration ({audio_duration}s) is too short for video length ({video_length}s). Creating silent audio.")
-                subprocess.run([
-                    'ffmpeg', '-y', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo', 
-                    '-t', str(video_length), f'assets/temp/{id}/background.mp3'
-                ], check=True)
-                print_substep("Created silent background audio successfully")
-            else:
-                # Usar la función corregida para calcular tiempos
-                start_time_audio, end_time_audio = get_start_and_end_times(video_length, int(audio_duration))
-                
-                print(f"[DEBUG] Using audio segment from {start_time_audio} to {end_time_audio}")
-                
-                # SOLUCIÓN AL ISSUE #2004: Usar FFmpeg directamente para MP3
-                # en lugar de MoviePy para evitar problemas de duración incorrecta
-                try:
-                    print_substep("Extracting audio with FFmpeg (avoiding MoviePy MP3 duration issue)...")
-                    subprocess.run([
-                        'ffmpeg', '-y', 
-                        '-ss', str(start_time_audio), 
-                        '-i', audio_file_path, 
-                        '-t', str(video_length),
-                        '-c:a', 'mp3', 
-                        '-q:a', '0', 
-                        f'assets/temp/{id}/background.mp3'
-                    ], check=True, capture_output=True)
-                    print_substep("Audio extraction with FFmpeg succeeded!")
-                    
-                    # Verificar que el archivo generado es válido
-                    if not os.path.exists(f'assets/temp/{id}/background.mp3') or os.path.getsize(f'assets/temp/{id}/background.mp3') == 0:
-                        raise Exception("Generated audio file is empty or doesn't exist")
-                        
-                except subprocess.CalledProcessError as e:
-                    print(f"[ERROR] FFMPEG extraction failed: {e}")
-                    print(f"[WARNING] FFmpeg stderr: {e.stderr.decode() if e.stderr else 'No stderr'}")
-                    # Fallback: crear audio silencioso
+                # Verificar que tenemos suficiente duración
+                if audio_duration <= video_length + 2:  # +2 para margen de seguridad
+                    print_substep(f"Audio duration ({audio_duration}s) is too short for video length ({video_length}s). Creating silent audio.")
                     subprocess.run([
                         'ffmpeg', '-y', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo', 
                         '-t', str(video_length), f'assets/temp/{id}/background.mp3'
                     ], check=True)
-                    print_substep("Created silent background audio as fallback")
+                    print_substep("Created silent background audio successfully")
+                else:
+                    # Usar la función corregida para calcular tiempos
+                    start_time_audio, end_time_audio = get_start_and_end_times(video_length, int(audio_duration))
+                
+                    log.debug("Using audio segment from %s to %s", start_time_audio, end_time_audio)
+                
+                    # SOLUCIÓN AL ISSUE #2004: Usar FFmpeg directamente para MP3
+                    # en lugar de MoviePy para evitar problemas de duración incorrecta
+                    try:
+                        print_substep("Extracting audio with FFmpeg (avoiding MoviePy MP3 duration issue)...")
+                        subprocess.run([
+                            'ffmpeg', '-y', 
+                            '-ss', str(start_time_audio), 
+                            '-i', audio_file_path, 
+                            '-t', str(video_length),
+                            '-c:a', 'mp3', 
+                            '-q:a', '0', 
+                            f'assets/temp/{id}/background.mp3'
+                        ], check=True, capture_output=True)
+                        print_substep("Audio extraction with FFmpeg succeeded!")
                     
-        except Exception as e:
-            print(f"[ERROR] Failed to process audio: {str(e)}")
-            # Fallback final: crear audio silencioso
-            subprocess.run([
-                'ffmpeg', '-y', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo', 
-                '-t', str(video_length), f'assets/temp/{id}/background.mp3'
-            ], check=True)
-            print_substep("Created silent background audio as final fallback")
-
-    print_step("Finding a spot in the backgrounds video to chop...✂️")
-    video_choice = f"{background_config['video'][2]}-{background_config['video'][1]}"
-    video_file_path = f"assets/backgrounds/video/{video_choice}"
+                        # Verificar que el archivo generado es válido
+                        if not os.path.exists(f'assets/temp/{id}/background.mp3') or os.path.getsize(f'assets/temp/{id}/background.mp3') == 0:
+                            raise Exception("Generated audio file is empty or doesn't exist")
+                        
+                    except subprocess.CalledProcessError as e:
+                        log.error("FFMPEG extraction failed: %s", e)
+                        log.warning("FFmpeg stderr: %s", e.stderr.decode() if e.stderr else 'No stderr')
+                        # Fallback: crear audio silencioso
+                        subprocess.run([
+                            'ffmpeg', '-y', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo', 
+                            '-t', str(video_length), f'assets/temp/{id}/background.mp3'
+                        ], check=True)
+                        print_substep("Created silent background audio as fallback")
+                    
+            except Exception as e:
+                log.error("Failed to process audio: %s", str(e))
+                # Fallback final: crear audio silencioso
+                subprocess.run([
+                    'ffmpeg', '-y', '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo', 
+                    '-t', str(video_length), f'assets/temp/{id}/background.mp3'
+                ], check=True)
+                print_substep("Created silent background audio as final fallback")
+
+    def _do_video():
+        print_step("Finding a spot in the backgrounds video to chop...✂️")
+        video_choice = f"{background_config['video'][2]}-{background_config['video'][1]}"
+        video_file_path = f"assets/backgrounds/video/{video_choice}"
     
-    try:
-        # Obtener duración del video con FFprobe
-        result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-            '-of', 'default=noprint_wrappers=1:nokey=1', video_file_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        video_duration = float(result.stdout.strip())
-        print(f"[DEBUG] FFProbe detected video duration: {video_duration}")
+        try:
+            # Obtener duración del video con FFprobe (cached across runs)
+            video_duration = get_duration(video_file_path)
+            log.debug("FFProbe detected video duration: %s", video_duration)
         
-        if video_duration <= video_length + 2:  # +2 para margen de seguridad
-            raise ValueError(f"Video duration ({video_duration}s) is too short for required length ({video_length}s)")
+            if video_duration <= video_length + 2:  # +2 para margen de seguridad
+                raise ValueError(f"Video duration ({video_duration}s) is too short for required length ({video_length}s)")
             
-        # Usar la función corregida para calcular tiempos
-        start_time_video, end_time_video = get_start_and_end_times(video_length, int(video_duration))
+            # Usar la función corregida para calcular tiempos
+            start_time_video, end_time_video = get_start_and_end_times(video_length, int(video_duration))
         
-        print(f"[DEBUG] Using video segment from {start_time_video} to {end_time_video}")
-        
-        # Usar FFmpeg directamente para video también
-        try:
-            subprocess.run([
-                'ffmpeg', '-y',
-                '-ss', str(start_time_video), 
-                '-i', video_file_path, 
-                '-t', str(video_length),
-                '-c:v', 'libx264', 
-                '-preset', 'fast', 
-                '-crf', '22',
-                f'assets/temp/{id}/background.mp4'
-            ], check=True, capture_output=True)
-            
-            # Verificar que el archivo de video es válido
-            if not os.path.exists(f'assets/temp/{id}/background.mp4') or os.path.getsize(f'assets/temp/{id}/background.mp4') == 0:
-                raise Exception("Generated video file is empty or doesn't exist")
+            log.debug("Using video segment from %s to %s", start_time_video, end_time_video)
+
+            def _extract_copy():
+                # GOP-aligned stream copy: the chop doesn't filter or resize, so when
+                # the source codec is kept there is nothing to re-encode
+                subprocess.run([
+                    'ffmpeg', '-y',
+                    '-ss', str(start_time_video),
+                    '-i', video_file_path,
+                    '-t', str(video_length),
+                    '-c', 'copy',
+                    '-avoid_negative_ts', 'make_zero',
+                    f'assets/temp/{id}/background.mp4'
+                ], check=True, capture_output=True)
+
+            def _run_encode(codec_args):
+                # Two-stage seek: a fast input-seek (-ss before -i) jumps to the nearest
+                # keyframe ~2s before the target, then the short output-seek decodes just
+                # the remainder so the cut is still frame-accurate.
+                coarse_seek = max(0, start_time_video - 2)
+                fine_seek = start_time_video - coarse_seek
+                subprocess.run([
+                    'ffmpeg', '-y',
+                    '-ss', str(coarse_seek),
+                    '-i', video_file_path,
+                    '-ss', str(fine_seek),
+                    '-t', str(video_length),
+                ] + codec_args + [
+                    f'assets/temp/{id}/background.mp4'
+                ], check=True, capture_output=True)
+
+            def _extract_encode():
+                hw_encoder = get_hw_encoder()
+                if hw_encoder:
+                    try:
+                        # fixed-function encoder: 5-20x realtime and leaves the CPU free
+                        _run_encode(HW_ENCODER_ARGS[hw_encoder])
+                        return
+                    except subprocess.CalledProcessError:
+                        # listed but unusable (no device/driver), drop to software
+                        print_substep(f"{hw_encoder} failed, falling back to libx264...")
+                _run_encode([
+                    '-c:v', 'libx264',
+                    '-preset', 'ultrafast',
+                    '-tune', 'zerolatency',
+                    '-threads', '0',
+                    '-crf', '22',
+                ])
+
+            # Usar FFmpeg directamente para video también
+            try:
+                codec = get_video_codec(video_file_path)
+                if codec == 'h264':
+                    # Already H.264: a byte copy of the window beats a minutes-long
+                    # re-encode, at the cost of a nearest-keyframe start
+                    _extract_copy()
+                else:
+                    _extract_encode()
+
+                # Verificar que el archivo de video es válido
+                if not os.path.exists(f'assets/temp/{id}/background.mp4') or os.path.getsize(f'assets/temp/{id}/background.mp4') == 0:
+                    raise Exception("Generated video file is empty or doesn't exist")
                 
-            # Verificar duración del video generado
-            verify_result = subprocess.run([
-                'ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', f'assets/temp/{id}/background.mp4'
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                # Verificar duración del video generado
+                verify_result = subprocess.run([
+                    'ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
+                    '-of', 'default=noprint_wrappers=1:nokey=1', f'assets/temp/{id}/background.mp4'
+                ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
             
-            generated_duration = float(verify_result.stdout.strip())
-            if generated_duration <= 0:
-                raise Exception(f"Generated video has invalid duration: {generated_duration}")
+                generated_duration = float(verify_result.stdout.strip())
+                if generated_duration <= 0:
+                    raise Exception(f"Generated video has invalid duration: {generated_duration}")
                 
-            print_substep("Background video chopped successfully with FFmpeg!")
+                print_substep("Background video chopped successfully with FFmpeg!")
             
-        except subprocess.CalledProcessError as e:
-            print(f"[WARNING] Direct FFmpeg approach for video failed: {e}")
-            print(f"[WARNING] FFmpeg stderr: {e.stderr.decode() if e.stderr else 'No stderr'}")
-            
-            # Fallback con MoviePy solo si FFmpeg falla completamente
-            try:
-                print_substep("Trying MoviePy as fallback for video...")
-                ffmpeg_extract_subclip(
-                    video_file_path,
-                    start_time_video,
-                    start_time_video + video_length,
-                    targetname=f"assets/temp/{id}/background.mp4",
-                )
-                print_substep("Background video chopped successfully with MoviePy fallback!")
-            except Exception as moviepy_error:
-                print(f"[ERROR] MoviePy fallback also failed: {moviepy_error}")
-                raise Exception("All video processing methods failed")
+            except subprocess.CalledProcessError as e:
+                log.warning("Direct FFmpeg approach for video failed: %s", e)
+                log.warning("FFmpeg stderr: %s", e.stderr.decode() if e.stderr else 'No stderr')
+
+                # Fallback: retry with the opposite strategy
+                try:
+                    if codec == 'h264':
+                        print_substep("Trying libx264 re-encode as fallback for video...")
+                        _extract_encode()
+                    else:
+                        print_substep("Trying ffmpeg stream copy as fallback for video...")
+                        _extract_copy()
+                    print_substep("Background video chopped successfully with fallback!")
+                except subprocess.CalledProcessError as fallback_error:
+                    log.error("Fallback extraction also failed: %s", fallback_error)
+                    raise Exception("All video processing methods failed")
             
-    except Exception as e:
-        print(f"[ERROR] Failed to process video: {str(e)}")
-        raise
-        
+        except Exception as e:
+            log.error("Failed to process video: %s", str(e))
+            raise
+
+    # Both chops are independent ffmpeg jobs on disjoint files; running them in two
+    # threads overlaps them, so the wall-time is max(audio, video) instead of the sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        audio_future = executor.submit(_do_audio)
+        video_future = executor.submit(_do_video)
+        audio_future.result()
+        video_future.result()
+
     print_substep("Background chopping completed successfully!", style="bold green")
     return background_config["video"][2]
 
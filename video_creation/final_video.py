@@ -280,18 +280,23 @@ def make_final_video(
             audio_clips = [ffmpeg.input(title_mp3_path)]
             audio_clips.insert(1, ffmpeg.input(postaudio_path))
         elif settings.config["settings"]["storymodemethod"] == 1:
-            # Ensure all postaudio files exist
-            for i in range(number_of_clips + 1):
-                postaudio_path = f"assets/temp/{reddit_id}/mp3/postaudio-{i}.mp3"
-                if not exists(postaudio_path):
-                    print_substep(f"Creating fallback audio for missing postaudio-{i}.mp3")
-                    create_silent_audio(postaudio_path, 1.0)
-            
-            audio_clips = [
-                ffmpeg.input(f"assets/temp/{reddit_id}/mp3/postaudio-{i}.mp3")
-                for i in track(range(number_of_clips + 1), "Collecting the audio files...")
-            ]
-            audio_clips.insert(0, ffmpeg.input(title_mp3_path))
+            postaudio_path = f"assets/temp/{reddit_id}/mp3/postaudio.mp3"
+            if exists(postaudio_path):
+                # The TTS engine already stream-copied all parts into one file
+                audio_clips = [ffmpeg.input(title_mp3_path), ffmpeg.input(postaudio_path)]
+            else:
+                # Ensure all postaudio files exist
+                for i in range(number_of_clips + 1):
+                    postaudio_path = f"assets/temp/{reddit_id}/mp3/postaudio-{i}.mp3"
+                    if not exists(postaudio_path):
+                        print_substep(f"Creating fallback audio for missing postaudio-{i}.mp3")
+                        create_silent_audio(postaudio_path, 1.0)
+
+                audio_clips = [
+                    ffmpeg.input(f"assets/temp/{reddit_id}/mp3/postaudio-{i}.mp3")
+                    for i in track(range(number_of_clips + 1), "Collecting the audio files...")
+                ]
+                audio_clips.insert(0, ffmpeg.input(title_mp3_path))
     else:
         # Check and create missing audio files for regular mode
         title_mp3_path = f"assets/temp/{reddit_id}/mp3/title.mp3"